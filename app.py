@@ -6,7 +6,10 @@ st.set_page_config(layout="wide", page_title="Jinja Tourism Assistant — Sunbir
 
 
 from src.config import SUPPORTED_LANGUAGES
-from src.utils.chat import handle_chat_interaction
+from src.utils.chat import handle_chat_interaction, render_metrics_page
+
+if render_metrics_page():
+    st.stop()
 
 
 st.sidebar.image("img/sunbird-favicon.jpg", use_container_width=True)
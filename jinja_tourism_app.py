@@ -6,38 +6,32 @@ A polished, audio‑enabled Streamlit app that answers tourism questions about
 **Jinja, Uganda** in **English, Runyankole, or Luganda** and offers an instant
 translator. Users can type **or record audio**; Sunbird ASR converts speech to
 text and the chat replies in the same language.
+
+Runs on the shared ``src`` pipeline (chat, ASR, translation) used by ``app.py``.
 """
 
 from __future__ import annotations
-import os
-from typing import Dict, List
-
-from openai import OpenAI
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"),
-api_key=os.getenv("OPENAI_API_KEY"))
-from openai import OpenAI
-import requests
-import streamlit as st
-from st_audiorec import st_audiorec
 from dotenv import load_dotenv
-
 load_dotenv()
 
+import streamlit as st
+
 # ──────────────────────────────────────────────────────────────────────────────
 # 🔧 CONFIGURATION & CONSTANTS
 # ──────────────────────────────────────────────────────────────────────────────
-if not openai.api_key:
-    st.error("OPENAI_API_KEY environment variable not set. Please set it for the app to function.")
-SUNBIRD_ASR_URL = os.getenv("SUNBIRD_ASR_URL", "https://api.sunbird.ai/speech-to-text")
-client = OpenAI()
+st.set_page_config(
+    page_title="Jinja Tourism Assistant — Sunbird AI",
+    page_icon="🦜",
+    layout="centered",
+)
 
-SUPPORTED_LANGUAGES: Dict[str, str] = {
-    "English": "English",
-    "Runyankole": "Runyankole",
-    "Luganda": "Luganda",
-}
-DEFAULT_MODEL = "gpt-4o-mini"
+from src.config import SUPPORTED_LANGUAGES
+from src.utils.chat import handle_chat_interaction, render_metrics_page
+from src.utils.translator import handle_translation_tab
+
+if render_metrics_page():
+    st.stop()
 
 # Sunbird palette (WCAG‑friendly)
 SUNBIRD_PRIMARY   = "#FF8200"  # vivid orange
@@ -48,12 +42,6 @@ SUNBIRD_BORDER    = "#CED9E5"  # soft border
 USER_BUBBLE_BG    = "#FFF4EB"  # 10 % orange
 BOT_BUBBLE_BG     = "#EAF2FF"  # 10 % blue
 
-st.set_page_config(
-    page_title="Jinja Tourism Assistant — Sunbird AI",
-    page_icon="🦜",
-    layout="centered",
-)
-
 # ──────────────────────────────────────────────────────────────────────────────
 # 🎨 GLOBAL STYLING
 # ──────────────────────────────────────────────────────────────────────────────
@@ -103,73 +91,6 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# ──────────────────────────────────────────────────────────────────────────────
-# 🧠 HELPER FUNCTIONS
-# ──────────────────────────────────────────────────────────────────────────────
-
-MAX_INPUT_LENGTH = 1000
-
-def validate_input(text: str) -> bool:
-    if not text.strip():
-        st.warning("Input cannot be empty.")
-        return False
-    if len(text) > MAX_INPUT_LENGTH:
-        st.warning(f"Input too long (>{MAX_INPUT_LENGTH} characters). Please shorten your message.")
-        return False
-    return True
-
-
-def call_openai(messages: List[Dict[str, str]], model: str = DEFAULT_MODEL) -> str:
-    """Wrapper around OpenAI Chat Completion."""
-    try:
-        resp = client.responses.create(model=model, input=messages)
-        return resp.output_text
-    except Exception as exc:
-        st.error(f"OpenAI error: {exc}")
-        return "(Sorry, something went wrong.)"
-
-
-def translate(text: str, target_lang: str) -> str:
-    sys_prompt = (
-        "You are a professional translator fluent in English, Runyankole, and Luganda. "
-        f"Translate the user's text into {target_lang}. Preserve meaning and tone."
-    )
-    messages = [
-        {"role": "system", "content": sys_prompt},
-        {"role": "user", "content": text},
-    ]
-    return call_openai(messages)
-
-
-def tourism_answer(question: str, lang: str) -> str:
-    sys_prompt = (
-        "You are a friendly, concise, factual tour guide for Jinja, Uganda. "
-        "Your knowledge covers attractions (Source of the Nile, Itanda & Bujagali Falls, kayaking, etc.), history, culture, transport, and indicative prices up to May 2025. "
-        "Respond ONLY in {lang}."
-    ).format(lang=lang)
-    messages = [
-        {"role": "system", "content": sys_prompt},
-        {"role": "user", "content": question},
-    ]
-    return call_openai(messages)
-
-
-def transcribe_audio_from_sunbird(audio_bytes: bytes, language_hint: str) -> str:
-    """Send WAV bytes to Sunbird ASR and return the transcript."""
-    try:
-        headers = {"Content-Type": "audio/wav"}
-        params = {"language": language_hint.lower()}
-        resp = requests.post(SUNBIRD_ASR_URL, headers=headers, params=params, data=audio_bytes, timeout=60)
-        resp.raise_for_status()
-        try:
-            return resp.json().get("text", "")
-        except ValueError:
-            st.error("ASR response was not valid JSON.")
-            return ""
-    except Exception as exc:
-        st.error(f"ASR error: {exc}")
-        return ""
-
 # ──────────────────────────────────────────────────────────────────────────────
 # 🎨 SIDEBAR
 # ──────────────────────────────────────────────────────────────────────────────
@@ -185,10 +106,6 @@ with st.sidebar:
         list(SUPPORTED_LANGUAGES.keys())
     )
 
-# Initialize chat history per language
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = {}
-
 # ──────────────────────────────────────────────────────────────────────────────
 # 🚀 MAIN LAYOUT
 # ──────────────────────────────────────────────────────────────────────────────
@@ -200,180 +117,16 @@ chat_tab, translate_tab = st.tabs(["🗣️ Chat", "🔄 Translate"])
 # ─── CHAT TAB ────────────────────────────────────────────────────────────────
 with chat_tab:
     st.subheader("Ask your question")
-
-    # ▶️ Record audio (optional)
-    st.markdown("###### Or record your question:")
-    audio_bytes = st_audiorec(
-        text="Click to record", icon_size="2x", recording_color=SUNBIRD_PRIMARY, neutral_color="#4B5563"
-    )
-
-    lang_key = f"{ui_language}_chat"
-    st.session_state.chat_history.setdefault(lang_key, [])
-
-    # Handle audio → transcript → reply
-    if audio_bytes:
-        with st.spinner("Transcribing…"):
-            user_text = transcribe_audio_from_sunbird(audio_bytes, SUPPORTED_LANGUAGES[ui_language])
-        if user_text and validate_input(user_text):
-            st.session_state.chat_history[lang_key].append({"role": "user", "content": user_text})
-            st.chat_message("user").markdown(user_text)
-            with st.spinner("Thinking…"):
-                bot_reply = tourism_answer(user_text, SUPPORTED_LANGUAGES[ui_language])
-            st.session_state.chat_history[lang_key].append({"role": "assistant", "content": bot_reply})
-            st.chat_message("assistant").markdown(bot_reply)
-
-    # Display previous messages
-    for msg in st.session_state.chat_history[lang_key]:
-        st.chat_message(msg["role"]).markdown(msg["content"])
-
-    # Text input fallback
-    if prompt := st.chat_input(f"Type your question in {ui_language}…"):
-        if validate_input(prompt):
-            st.session_state.chat_history[lang_key].append({"role": "user", "content": prompt})
-            st.chat_message("user").markdown(prompt)
-            with st.spinner("Thinking…"):
-                bot_reply = tourism_answer(prompt, SUPPORTED_LANGUAGES[ui_language])
-            st.session_state.chat_history[lang_key].append({"role": "assistant", "content": bot_reply})
-            st.chat_message("assistant").markdown(bot_reply)
+    st.markdown("###### Type or record your question:")
+    handle_chat_interaction(ui_language)
 
 # ─── TRANSLATE TAB ────────────────────────────────────────────────────────────
 with translate_tab:
     st.subheader("Quick translator")
-    src_text = st.text_area("Enter text to translate", height=120)
-    col1, col2 = st.columns(2)
-    with col1:
-        tgt_lang = st.selectbox("Translate into …", list(SUPPORTED_LANGUAGES.keys()), index=0)
-    with col2:
-        translate_btn = st.button("Translate", use_container_width=True)
-
-    if translate_btn and src_text:
-        if validate_input(src_text):
-            with st.spinner("Translating…"):
-                tgt_text = translate(src_text, SUPPORTED_LANGUAGES[tgt_lang])
-            st.success("Translation complete!")
-            st.text_area("Translation", tgt_text, height=120)
+    handle_translation_tab()
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 📢 FOOTER
 # ──────────────────────────────────────────────────────────────────────────────
 st.markdown("<hr style='border-top: 1px solid #EEE;'>", unsafe_allow_html=True)
 st.markdown("<small>Built by <b>Sunbird AI</b> • MIT License • © 2025</small>", unsafe_allow_html=True)
-
-###############################################################################
-# Note: This code is a simplified version of the original app.py and utils.
-
-
-import streamlit as st
-import requests
-import os
-from dotenv import load_dotenv
-from src.config import ASR_LANGUAGE_CODES
-
-load_dotenv()
-
-SUNBIRD_ASR_URL = "https://api.sunbird.ai/tasks/stt"
-AUTH_TOKEN = os.getenv("AUTH_TOKEN")
-
-def transcribe_audio(language: str, audio_bytes: bytes) -> str:
-    if not audio_bytes:
-        return ""
-
-    lang_code = ASR_LANGUAGE_CODES.get(language, "eng")
-
-    headers = {
-        "accept": "application/json",
-        "Authorization": f"Bearer {AUTH_TOKEN}",
-    }
-
-    files = {
-        "audio": ("input.wav", audio_bytes, "audio/wav"),
-    }
-
-    data = {
-        "language": lang_code,
-        "adapter": lang_code,
-        "whisper": "true",
-    }
-
-    try:
-        with st.spinner("Transcribing via Sunbird…"):
-            response = requests.post(
-                SUNBIRD_ASR_URL,
-                headers=headers,
-                files=files,
-                data=data,
-                timeout=60
-            )
-            response.raise_for_status()
-            return response.json().get("audio_transcription", "")
-    except Exception as e:
-        st.error(f"Sunbird ASR error: {e}")
-        return ""
-
-
-# This code is a simplified version of the original app.py and utils.
-
-import streamlit as st
-from openai import OpenAI
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"),
-api_key=os.getenv("OPENAI_API_KEY"))
-from src.config import DEFAULT_MODEL, SUPPORTED_LANGUAGES
-from src.utils.asr import transcribe_audio
-from src.utils.common import validate_input
-import streamlit as st
-import os
-
-
-def tourism_answer(question: str, lang: str) -> str:
-    messages = [
-        {"role": "system", "content": f"You are a friendly Jinja tour guide. Reply only in {lang}."},
-        {"role": "user", "content": question},
-    ]
-    return call_openai(messages)
-
-def call_openai(messages, model=DEFAULT_MODEL):
-    try:
-        resp = client.chat.completions.create(model=model, messages=messages)
-        return resp.choices[0].message.content.strip()
-    except Exception as exc:
-        st.error(f"OpenAI error: {exc}")
-        return "(Sorry, something went wrong.)"
-
-def handle_chat_interaction(language: str):
-    lang_key = f"{language}_chat"
-    st.session_state.chat_history = st.session_state.get("chat_history", {})
-    st.session_state.chat_history.setdefault(lang_key, [])
-
-    # 1. Display chat history (WhatsApp style: user right, assistant left)
-    for msg in st.session_state.chat_history[lang_key]:
-        if msg["role"] == "user":
-            st.chat_message("user").markdown(msg["content"])
-        else:
-            st.chat_message("assistant").markdown(msg["content"])
-
-    # 2. Layout for input (audio + text) at the bottom
-    col1, col2 = st.columns([1, 4])
-    with col1:
-        audio_bytes = st.audio_input("🎙️ Record your question",label_visibility="hidden")
-        # st.audio(audio_bytes)
-    with col2:
-        prompt = st.chat_input(f"Type your question in {language}…")
-
-    # 3. Handle audio input
-    if audio_bytes:
-        transcript = transcribe_audio(language, audio_bytes)
-        if transcript and validate_input(transcript):
-            st.session_state.chat_history[lang_key].append({"role": "user", "content": transcript})
-            with st.spinner("Thinking…"):
-                reply = tourism_answer(transcript, SUPPORTED_LANGUAGES[language])
-            st.session_state.chat_history[lang_key].append({"role": "assistant", "content": reply})
-            # st.experimental_rerun()  # Refresh to show new messages and reset recorder
-
-    # 4. Handle text input
-    if prompt and validate_input(prompt):
-        st.session_state.chat_history[lang_key].append({"role": "user", "content": prompt})
-        with st.spinner("Thinking…"):
-            reply = tourism_answer(prompt, SUPPORTED_LANGUAGES[language])
-        st.session_state.chat_history[lang_key].append({"role": "assistant", "content": reply})
-        # st.experimental_rerun()  # Refresh to show new messages
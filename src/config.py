@@ -29,3 +29,29 @@ ASR_LANGUAGE_CODES = {
 }
 
 DEFAULT_MODEL = "gpt-4o-mini"
+
+# SESSION STORE
+CHAT_HISTORY_MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", "50"))
+SESSION_IDLE_SECONDS = int(os.getenv("SESSION_IDLE_SECONDS", "900"))
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", ".sessions.sqlite3")
+SESSION_RETENTION_SECONDS = int(os.getenv("SESSION_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+# UPSTREAM TRANSPORT ("live", "record" or "replay")
+TRANSPORT_MODE = os.getenv("TRANSPORT_MODE", "live")
+TRANSPORT_CASSETTE_PATH = os.getenv("TRANSPORT_CASSETTE_PATH", "cassettes/upstream.jsonl")
+TRANSPORT_REPLAY_LATENCY_SCALE = float(os.getenv("TRANSPORT_REPLAY_LATENCY_SCALE", "1.0"))
+
+# ANSWER PIPELINE per non-English language:
+#   "chain": RunPod question translation -> OpenAI -> NLLB per answer line
+#   "nllb":  NLLB question translation -> OpenAI -> NLLB per answer line
+#            (same hops as "chain"; only the question translator differs)
+#   "ug40":  a single RunPod Gemma call answering directly in the language
+#            (the only mode with fewer hops)
+PIPELINE_MODES = {
+    "Runyankole": os.getenv("PIPELINE_MODE_RUNYANKOLE", "chain"),
+    "Luganda": os.getenv("PIPELINE_MODE_LUGANDA", "chain"),
+}
+
+# NLLB TRANSLATION
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "2048"))
+TRANSLATE_MAX_WORKERS = int(os.getenv("TRANSLATE_MAX_WORKERS", "4"))
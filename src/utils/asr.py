@@ -1,8 +1,10 @@
 import streamlit as st
 import requests
 import os
+import hashlib
 from dotenv import load_dotenv
 from src.config import ASR_LANGUAGE_CODES
+from src.utils.transport import get_transport
 
 load_dotenv()
 
@@ -30,17 +32,24 @@ def transcribe_audio(language: str, audio_bytes: bytes) -> str:
         "whisper": "true",
     }
 
+    def send():
+        response = requests.post(
+            SUNBIRD_ASR_URL,
+            headers=headers,
+            files=files,
+            data=data,
+            timeout=60
+        )
+        response.raise_for_status()
+        return response.json()
+
     try:
+        # st.audio_input returns an UploadedFile (a BytesIO), not bytes.
+        raw = audio_bytes.getvalue() if hasattr(audio_bytes, "getvalue") else audio_bytes
+        # Cassettes identify the clip by its hash rather than storing the audio.
+        request = dict(data, audio_sha256=hashlib.sha256(raw).hexdigest())
         with st.spinner("Transcribing via Sunbird…"):
-            response = requests.post(
-                SUNBIRD_ASR_URL,
-                headers=headers,
-                files=files,
-                data=data,
-                timeout=60
-            )
-            response.raise_for_status()
-            return response.json().get("audio_transcription", "")
+            return get_transport().exchange("sunbird_stt", request, send).get("audio_transcription", "")
     except Exception as e:
         st.error(f"Sunbird ASR error: {e}")
         return ""
\ No newline at end of file
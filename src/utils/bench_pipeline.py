@@ -0,0 +1,45 @@
+"""
+Compares the answer pipeline modes on the sample tourism questions, using
+each language's own section of tourism_questions.txt.
+
+    python -m src.utils.bench_pipeline [Luganda Runyankole]
+
+Set TRANSPORT_MODE=record for a live run that also fills the cassette, then
+TRANSPORT_MODE=replay to repeat the comparison offline.
+"""
+import sys
+import time
+
+from src.utils.chat import ANSWER_PIPELINES, tourism_answer
+from src.utils.language_id import read_sections
+from src.utils.translate import clear_translation_cache
+from src.utils.transport import get_transport
+
+QUESTIONS_PATH = "src/utils/tourism_questions.txt"
+MODES = [mode for mode in ANSWER_PIPELINES if mode != "english"]
+
+
+def bench(questions_by_language: dict) -> list:
+    rows = []
+    for lang, questions in questions_by_language.items():
+        for mode in MODES:
+            # Start every mode cold so earlier modes' NLLB results are not reused.
+            clear_translation_cache()
+            calls, seconds = 0, 0.0
+            for question in questions:
+                start = time.perf_counter()
+                with get_transport().track() as tracked:
+                    tourism_answer(question, lang, mode=mode)
+                seconds += time.perf_counter() - start
+                calls += sum(c["calls"] for c in tracked.values())
+            rows.append((lang, mode, calls / len(questions), seconds / len(questions)))
+    return rows
+
+
+if __name__ == "__main__":
+    languages = sys.argv[1:] or ["Luganda", "Runyankole"]
+    sections = read_sections(QUESTIONS_PATH)
+    questions_by_language = {lang: sections[lang] for lang in languages}
+    print(f"{'language':<12} {'mode':<6} {'calls/answer':>12} {'s/answer':>9}")
+    for lang, mode, calls, seconds in bench(questions_by_language):
+        print(f"{lang:<12} {mode:<6} {calls:>12.1f} {seconds:>9.2f}")
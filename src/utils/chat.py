@@ -1,11 +1,16 @@
 import streamlit as st
 from openai import OpenAI
 import logging
+import time
+import uuid
 
-from src.config import DEFAULT_MODEL, SUPPORTED_LANGUAGES, ASR_LANGUAGE_CODES
+from src.config import DEFAULT_MODEL, SUPPORTED_LANGUAGES, ASR_LANGUAGE_CODES, PIPELINE_MODES
 from src.utils.asr import transcribe_audio
 from src.utils.common import validate_input
-from src.utils.translate import ug40_translate, translate_texts
+from src.utils.language_id import detect_language
+from src.utils.session_store import SessionStore
+from src.utils.translate import ug40_answer, ug40_translate, translate, translate_texts
+from src.utils.transport import get_transport
 import streamlit as st
 import os
 from dotenv import load_dotenv
@@ -17,31 +22,125 @@ logger = logging.getLogger(__name__)
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", st.secrets["OPENAI_API_KEY"]))
 
 
-def tourism_answer(question: str, lang: str) -> str:
+@st.cache_resource
+def get_session_store() -> SessionStore:
+    return SessionStore()
+
+
+def render_metrics_page() -> bool:
+    """
+    Render session store and upstream call counters as JSON when the page is
+    opened with ``?metrics``. Returns True if the metrics page was rendered.
+    """
+    if "metrics" not in st.query_params:
+        return False
+    st.json({"sessions": get_session_store().metrics.snapshot(), "upstream": get_transport().stats()})
+    return True
+
+
+def tourism_answer(question: str, lang: str, mode: str = None) -> str:
+    """
+    Answers a tourism question in ``lang``.
+
+    Non-English answers use ``mode`` (default: ``PIPELINE_MODES[lang]``), one of
+    "chain", "nllb" or "ug40"; see ``src/config.py``. English answers always use
+    the "english" pipeline, and any other ``mode`` raises ``ValueError``.
+    Upstream call counts and latency are logged per answer so the modes can be
+    compared.
+    """
     logger.info(f"Answering question: {question} in language: {lang}")
     logger.info(f"ASR language code: {ASR_LANGUAGE_CODES[lang]}")
     if lang == "English":
-        # Use the default model for English
-        messages = [
-            {"role": "system", "content": "You are a friendly Jinja tour guide."},
-            {"role": "user", "content": question},
-        ]
-        return call_openai(messages)
+        if mode not in (None, "english"):
+            raise ValueError(f"Pipeline mode {mode} does not apply to English answers")
+        mode = "english"
     else:
-        # Use the translation model for other languages
+        mode = mode or PIPELINE_MODES.get(lang, "chain")
+    if mode not in ANSWER_PIPELINES:
+        raise ValueError(f"Unknown pipeline mode: {mode}")
+    start = time.perf_counter()
+    with get_transport().track() as calls:
+        answer = ANSWER_PIPELINES[mode](question, lang)
+    logger.info(
+        f"Pipeline {mode} for {lang}: {sum(c['calls'] for c in calls.values())} upstream calls "
+        f"in {time.perf_counter() - start:.2f}s {calls}"
+    )
+    return answer
+
+
+def _input_language(question: str, lang: str) -> str:
+    # Code-switching users often type English with Luganda/Runyankole selected, and
+    # vice versa. Only leave the UI language when the text clearly is another one.
+    ui_code = ASR_LANGUAGE_CODES[lang]
+    input_code = detect_language(question, expected=ui_code) or ui_code
+    logger.info(f"Detected input language code: {input_code}")
+    return input_code
+
+
+def _generate_english_reply(question: str) -> str:
+    # English-only reply from OpenAI that chain/nllb then translate into the target language
+    messages = [
+        {"role": "system", "content": "You are a friendly Jinja tour guide. Reply only in English."},
+        {"role": "user", "content": question},
+    ]
+    return call_openai(messages)
+
+
+def _answer_english(question: str, lang: str) -> str:
+    if _input_language(question, lang) != ASR_LANGUAGE_CODES["English"]:
+        question = ug40_translate(question, "English")
+        logger.info(f"Translated question: {question}")
+    # Use the default model for English
+    messages = [
+        {"role": "system", "content": "You are a friendly Jinja tour guide."},
+        {"role": "user", "content": question},
+    ]
+    return call_openai(messages)
+
+
+def _answer_chain(question: str, lang: str) -> str:
+    # RunPod question translation -> OpenAI -> NLLB per line (2 + N calls)
+    if _input_language(question, lang) != ASR_LANGUAGE_CODES["English"]:
         question = ug40_translate(question, "English")
         logger.info(f"Translated question: {question}")
-        messages = [
-            {"role": "system", "content": "You are a friendly Jinja tour guide. Reply only in English."},
-            {"role": "user", "content": question},
-        ]
-        
-        response = call_openai(messages)
-        response_texts = response.split("\n")
-        translated_response = translate_texts(response_texts, ASR_LANGUAGE_CODES["English"], ASR_LANGUAGE_CODES[lang])
-        logger.info(f"Translated response: {translated_response}")
-        return translated_response
-    
+    response = _generate_english_reply(question)
+    response_texts = response.split("\n")
+    translated_response = translate_texts(response_texts, ASR_LANGUAGE_CODES["English"], ASR_LANGUAGE_CODES[lang])
+    logger.info(f"Translated response: {translated_response}")
+    return translated_response
+
+
+def _answer_nllb(question: str, lang: str) -> str:
+    # Same hops as chain (1 + 1 + N calls), with NLLB instead of RunPod translating the question
+    input_code = _input_language(question, lang)
+    if input_code != ASR_LANGUAGE_CODES["English"]:
+        try:
+            question = translate(question, input_code, ASR_LANGUAGE_CODES["English"])
+        except Exception:
+            return "**Error:** Some thing wrong happened! Please try again."
+        logger.info(f"Translated question: {question}")
+    response = _generate_english_reply(question)
+    translated_response = translate_texts(response.split("\n"), ASR_LANGUAGE_CODES["English"], ASR_LANGUAGE_CODES[lang])
+    logger.info(f"Translated response: {translated_response}")
+    return translated_response
+
+
+def _answer_ug40(question: str, lang: str) -> str:
+    # A single RunPod call answering directly in the target language
+    try:
+        return ug40_answer(question, lang)
+    except Exception as exc:
+        st.error(f"RunPod error: {exc}")
+        return "(Sorry, something went wrong.)"
+
+
+ANSWER_PIPELINES = {
+    "english": _answer_english,
+    "chain": _answer_chain,
+    "nllb": _answer_nllb,
+    "ug40": _answer_ug40,
+}
+
 
 def call_openai(messages, model=DEFAULT_MODEL):
     try:
@@ -53,12 +152,14 @@ def call_openai(messages, model=DEFAULT_MODEL):
             elif msg["role"] == "user":
                 prompt_str += "User: " + msg["content"] + "\n"
         prompt_str += "Assistant:"
-        resp = client.responses.create(
-            input=prompt_str,
-            model=model,
-        )
-        logger.info(f"OpenAI response: {resp.output_text}")
-        return resp.output_text.strip()
+        request = {"model": model, "input": prompt_str}
+
+        def send():
+            return {"output_text": client.responses.create(**request).output_text}
+
+        output_text = get_transport().exchange("openai_responses", request, send)["output_text"]
+        logger.info(f"OpenAI response: {output_text}")
+        return output_text.strip()
     except Exception as exc:
         logger.error(f"OpenAI error: {exc}")
         st.error(f"OpenAI error: {exc}")
@@ -67,42 +168,43 @@ def call_openai(messages, model=DEFAULT_MODEL):
 def handle_chat_interaction(language: str):
     logger.info(f"Handling chat interaction for language: {language}")
     lang_key = f"{language}_chat"
-    st.session_state.chat_history = st.session_state.get("chat_history", {})
-    st.session_state.chat_history.setdefault(lang_key, [])
+    session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+    store = get_session_store()
+    store.offload_idle()
+    history = store.history(session_id, lang_key)
 
     # 1. Display chat history
-    for msg in st.session_state.chat_history[lang_key]:
+    for msg in history:
         if msg["role"] == "user":
             st.chat_message("user").markdown(msg["content"])
         else:
             st.chat_message("assistant").markdown(msg["content"])
 
     # 2. Layout for input (audio + text) at the bottom
+    # The recorder key changes after each processed clip, which drops the old
+    # audio bytes from session state instead of holding them until the next recording.
+    audio_key = f"audio_input_{st.session_state.get('audio_generation', 0)}"
     col1, col2 = st.columns([1, 4])
     with col1:
-        audio_bytes = st.audio_input("🎙️ Record your question", label_visibility="hidden", key="audio_input")
+        audio_bytes = st.audio_input("🎙️ Record your question", label_visibility="hidden", key=audio_key)
     with col2:
         prompt = st.chat_input(f"Type your question in {language}…")
 
-    # --- Fix: Only process audio if not already processed ---
-    if audio_bytes and not st.session_state.get("audio_processed", False):
+    # 3. Handle audio input
+    if audio_bytes:
         transcript = transcribe_audio(language, audio_bytes)
+        st.session_state.audio_generation = st.session_state.get("audio_generation", 0) + 1
         if transcript and validate_input(transcript):
-            st.session_state.chat_history[lang_key].append({"role": "user", "content": transcript})
+            history.append("user", transcript)
             with st.spinner("Thinking…"):
                 reply = tourism_answer(transcript, SUPPORTED_LANGUAGES[language])
-            st.session_state.chat_history[lang_key].append({"role": "assistant", "content": reply})
-            st.session_state.audio_processed = True  # Set flag
+            history.append("assistant", reply)
             st.rerun()  # Refresh to show new messages and reset recorder
 
-    # --- Reset the flag when there's no audio_bytes (i.e., after rerun and widget is cleared) ---
-    if not audio_bytes and st.session_state.get("audio_processed", False):
-        st.session_state.audio_processed = False
-
     # 4. Handle text input
     if prompt and validate_input(prompt):
-        st.session_state.chat_history[lang_key].append({"role": "user", "content": prompt})
+        history.append("user", prompt)
         with st.spinner("Thinking…"):
             reply = tourism_answer(prompt, SUPPORTED_LANGUAGES[language])
-        st.session_state.chat_history[lang_key].append({"role": "assistant", "content": reply})
+        history.append("assistant", reply)
         st.rerun()
@@ -0,0 +1,153 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(UTILS_DIR, "langid_model.json")
+CORPUS_DIR = os.path.join(UTILS_DIR, "langid_corpus")
+# Place names from the glossary and language names appear unchanged in every
+# language, so they are removed before training and scoring.
+GLOSSARY_PATH = os.path.join(UTILS_DIR, "glossary.json")
+LANGUAGE_NAMES = ("English", "Luganda", "Runyankole", "Runyankore", "Ganda", "Nkore")
+# Extra text already shipped with the repo: (file, "# <section>" or None for the whole file).
+EXTRA_CORPORA = {
+    "eng": [("tourism_questions.txt", "English"), ("translate_text.txt", None)],
+    "lug": [("tourism_questions.txt", "Luganda")],
+    "nyn": [("tourism_questions.txt", "Runyankole")],
+}
+
+NGRAM_ORDERS = (1, 2, 3)
+MAX_NGRAMS_PER_LANGUAGE = 3000
+# Below this many letters the detector does not trust itself.
+MIN_TEXT_LENGTH = 8
+# Minimum per-n-gram log-probability gap between the best and second-best language.
+MIN_MARGIN = 0.05
+# Gap another language needs over the expected (UI) language to override it. The
+# model is trained on little text, so short English phrases can lean Bantu by ~0.2.
+SWITCH_MARGIN = 0.3
+
+
+@lru_cache(maxsize=1)
+def _neutral_terms_re():
+    with open(GLOSSARY_PATH, "r", encoding="utf-8") as f:
+        terms = list(json.load(f)) + list(LANGUAGE_NAMES)
+    terms.sort(key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, terms)) + r")\b", re.IGNORECASE)
+
+
+def _normalise(text: str) -> str:
+    text = _neutral_terms_re().sub(" ", text)
+    text = re.sub(r"[^\w']+", " ", text.lower())
+    text = re.sub(r"\d+", " ", text)
+    return " ".join(text.split())
+
+
+def _ngrams(text: str):
+    for word in _normalise(text).split():
+        padded = f" {word} "
+        for n in NGRAM_ORDERS:
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                if gram.strip():
+                    yield gram
+
+
+def read_sections(path: str, default: str = "English") -> dict:
+    """
+    Splits a text file into ``{section: [lines]}`` on ``# <section>`` header
+    lines. Lines before the first header belong to ``default``.
+    """
+    sections, current = {}, default
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("#"):
+                current = line.lstrip("#").strip()
+            elif line:
+                sections.setdefault(current, []).append(line)
+    return sections
+
+
+def build_model(corpus_dir: str = CORPUS_DIR) -> dict:
+    """
+    Builds a character n-gram model from ``<corpus_dir>/<lang_code>.txt`` files.
+
+    Returns:
+        dict: ``{"languages": {code: {ngram: log_prob}}, "unseen": {code: log_prob}}``.
+    """
+    languages, unseen = {}, {}
+    for filename in sorted(os.listdir(corpus_dir)):
+        code, ext = os.path.splitext(filename)
+        if ext != ".txt":
+            continue
+        counts = Counter()
+        with open(os.path.join(corpus_dir, filename), "r", encoding="utf-8") as f:
+            counts.update(_ngrams(f.read()))
+        for extra, section in EXTRA_CORPORA.get(code, []):
+            path = os.path.join(UTILS_DIR, extra)
+            if section is None:
+                with open(path, "r", encoding="utf-8") as f:
+                    counts.update(_ngrams(f.read()))
+            else:
+                counts.update(_ngrams("\n".join(read_sections(path).get(section, []))))
+        top = counts.most_common(MAX_NGRAMS_PER_LANGUAGE)
+        # Add-one smoothing over the retained n-grams plus one bucket for everything else.
+        total = sum(c for _, c in top) + len(top) + 1
+        languages[code] = {gram: round(math.log((c + 1) / total), 4) for gram, c in top}
+        unseen[code] = round(math.log(1 / total), 4)
+    return {"languages": languages, "unseen": unseen}
+
+
+@lru_cache(maxsize=1)
+def load_model(path: str = MODEL_PATH) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def language_scores(text: str) -> dict:
+    """Average per-n-gram log-probability of ``text`` under each language."""
+    model = load_model()
+    grams = list(_ngrams(text))
+    if not grams:
+        return {}
+    scores = {}
+    for code, table in model["languages"].items():
+        floor = model["unseen"][code]
+        scores[code] = sum(table.get(gram, floor) for gram in grams) / len(grams)
+    return scores
+
+
+def detect_language(text: str, expected: str = None):
+    """
+    Detects whether ``text`` is English, Luganda or Runyankole.
+
+    With ``expected`` (e.g. the UI language), a different language is only
+    returned when it beats ``expected`` by ``SWITCH_MARGIN``; otherwise the
+    result is ``expected``.
+
+    Returns:
+        str | None: ``"eng"``, ``"lug"`` or ``"nyn"``, or ``None`` when the text is
+        too short or too ambiguous to call.
+    """
+    if len(_normalise(text).replace(" ", "")) < MIN_TEXT_LENGTH:
+        return None
+    scores = language_scores(text)
+    if len(scores) < 2:
+        return next(iter(scores), None)
+    best, second = sorted(scores, key=scores.get, reverse=True)[:2]
+    if expected in scores and best != expected:
+        return best if scores[best] - scores[expected] >= SWITCH_MARGIN else expected
+    if scores[best] - scores[second] < MIN_MARGIN:
+        return None
+    return best
+
+
+if __name__ == "__main__":
+    # Rebuild the shipped model from the corpora: python -m src.utils.language_id
+    model = build_model()
+    with open(MODEL_PATH, "w", encoding="utf-8") as f:
+        json.dump(model, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    print(f"Wrote {MODEL_PATH} ({', '.join(model['languages'])})")
@@ -0,0 +1,211 @@
+import base64
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+from src.config import CHAT_HISTORY_MAX_MESSAGES, SESSION_IDLE_SECONDS, SESSION_RETENTION_SECONDS, SESSION_STORE_PATH
+
+logger = logging.getLogger(__name__)
+
+# Roles are stored as an index into this tuple instead of a string per message.
+ROLES = ("user", "assistant")
+# Texts shorter than this are not worth the zlib header overhead.
+COMPRESS_MIN_LENGTH = 64
+
+
+class SessionMetrics:
+    """
+    Running totals for the in-memory session store, updated as messages are
+    appended and sessions are loaded or offloaded, so reading them is O(1).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {"sessions": 0, "messages": 0, "bytes": 0, "offloaded_sessions": 0, "purged_sessions": 0}
+
+    def add(self, **deltas) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                self._values[name] += delta
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+
+def _message_size(message: tuple) -> int:
+    return sys.getsizeof(message) + sys.getsizeof(message[2])
+
+
+class ChatHistory:
+    """
+    Compact, capped chat history for a single conversation.
+
+    Each message is kept as a ``(role_index, compressed, payload)`` tuple where
+    ``payload`` is UTF-8 bytes, zlib-compressed when that makes it smaller.
+    Only the newest ``max_messages`` messages are retained.
+    """
+
+    __slots__ = ("_messages", "_nbytes", "max_messages", "metrics")
+
+    def __init__(self, max_messages: int = CHAT_HISTORY_MAX_MESSAGES, metrics: SessionMetrics = None):
+        self._messages = []
+        self._nbytes = 0
+        self.max_messages = max_messages
+        self.metrics = metrics
+
+    def append(self, role: str, content: str) -> None:
+        raw = content.encode("utf-8")
+        compressed = False
+        if len(raw) >= COMPRESS_MIN_LENGTH:
+            packed = zlib.compress(raw, 6)
+            if len(packed) < len(raw):
+                raw, compressed = packed, True
+        message = (ROLES.index(role), compressed, raw)
+        self._messages.append(message)
+        added, nbytes = 1, _message_size(message)
+        if self.max_messages > 0 and len(self._messages) > self.max_messages:
+            dropped = self._messages[: len(self._messages) - self.max_messages]
+            del self._messages[: len(dropped)]
+            added -= len(dropped)
+            nbytes -= sum(map(_message_size, dropped))
+        self._nbytes += nbytes
+        if self.metrics is not None:
+            self.metrics.add(messages=added, bytes=nbytes)
+
+    def __iter__(self):
+        for role_idx, compressed, payload in self._messages:
+            text = zlib.decompress(payload) if compressed else payload
+            yield {"role": ROLES[role_idx], "content": text.decode("utf-8")}
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def nbytes(self) -> int:
+        """Approximate number of bytes held by this history's messages."""
+        return self._nbytes
+
+    def to_list(self) -> list:
+        return [[role_idx, compressed, base64.b64encode(payload).decode("ascii")] for role_idx, compressed, payload in self._messages]
+
+    @classmethod
+    def from_list(cls, items: list, max_messages: int = CHAT_HISTORY_MAX_MESSAGES, metrics: SessionMetrics = None) -> "ChatHistory":
+        history = cls(max_messages, metrics)
+        history._messages = [(role_idx, compressed, base64.b64decode(payload)) for role_idx, compressed, payload in items]
+        if max_messages > 0:
+            history._messages = history._messages[-max_messages:]
+        history._nbytes = sum(map(_message_size, history._messages))
+        if metrics is not None:
+            metrics.add(messages=len(history), bytes=history._nbytes)
+        return history
+
+
+class SessionStore:
+    """
+    Process-wide store for chat histories, keyed by session id.
+
+    Streamlit's ``st.session_state`` only holds the session id; histories live
+    here so that sessions which have been idle for ``idle_seconds`` can be
+    offloaded to a local SQLite (WAL) database and reloaded on their next
+    interaction. Offloaded sessions not reloaded within ``retention_seconds``
+    are deleted.
+    """
+
+    def __init__(
+        self,
+        path: str = SESSION_STORE_PATH,
+        idle_seconds: int = SESSION_IDLE_SECONDS,
+        retention_seconds: int = SESSION_RETENTION_SECONDS,
+    ):
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self.retention_seconds = retention_seconds
+        self._next_purge = 0.0
+        self._sessions = {}
+        self._last_access = {}
+        self._lock = threading.Lock()
+        self.metrics = SessionMetrics()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, payload BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)")
+        self._conn.commit()
+
+    def history(self, session_id: str, lang_key: str) -> ChatHistory:
+        """Return the history for ``lang_key`` in a session, reloading it from disk if needed."""
+        with self._lock:
+            self._last_access[session_id] = time.monotonic()
+            histories = self._sessions.get(session_id)
+            if histories is None:
+                histories = self._load(session_id)
+                self._sessions[session_id] = histories
+                self.metrics.add(sessions=1)
+            if lang_key not in histories:
+                histories[lang_key] = ChatHistory(metrics=self.metrics)
+            return histories[lang_key]
+
+    def offload_idle(self) -> int:
+        """
+        Persist and evict every session idle for longer than ``idle_seconds``,
+        and purge offloaded sessions older than ``retention_seconds``.
+        """
+        now = time.monotonic()
+        cutoff = now - self.idle_seconds
+        with self._lock:
+            if now >= self._next_purge:
+                self._purge_expired()
+                self._next_purge = now + self.idle_seconds
+            idle = [sid for sid, ts in self._last_access.items() if ts < cutoff]
+            for session_id in idle:
+                histories = self._sessions.pop(session_id, {})
+                self._save(session_id, histories)
+                del self._last_access[session_id]
+                for history in histories.values():
+                    history.metrics = None
+                self.metrics.add(
+                    sessions=-1,
+                    offloaded_sessions=1,
+                    messages=-sum(len(h) for h in histories.values()),
+                    bytes=-sum(h.nbytes() for h in histories.values()),
+                )
+            if idle:
+                self._conn.commit()
+        if idle:
+            logger.info(f"Offloaded {len(idle)} idle session(s) to {self.path}")
+        return len(idle)
+
+    def _purge_expired(self) -> None:
+        cursor = self._conn.execute(
+            "DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.retention_seconds,)
+        )
+        self._conn.commit()
+        if cursor.rowcount > 0:
+            self.metrics.add(purged_sessions=cursor.rowcount)
+            logger.info(f"Purged {cursor.rowcount} expired session(s) from {self.path}")
+
+    def _load(self, session_id: str) -> dict:
+        row = self._conn.execute("SELECT payload FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            return {}
+        self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        self._conn.commit()
+        data = json.loads(zlib.decompress(row[0]))
+        return {lang_key: ChatHistory.from_list(items, metrics=self.metrics) for lang_key, items in data.items()}
+
+    def _save(self, session_id: str, histories: dict) -> None:
+        if not histories:
+            return
+        data = {lang_key: history.to_list() for lang_key, history in histories.items()}
+        payload = zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, payload, updated_at) VALUES (?, ?, ?)",
+            (session_id, payload, time.time()),
+        )
@@ -5,6 +5,13 @@ import backoff  # pip install backoff
 import streamlit as st
 from dotenv import load_dotenv, find_dotenv
 import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from src.config import TRANSLATION_CACHE_SIZE, TRANSLATE_MAX_WORKERS
+from src.utils.translation_memory import get_translation_memory
+from src.utils.transport import get_transport
 
 load_dotenv(find_dotenv())
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +31,20 @@ client = OpenAI(
     base_url=f"https://api.runpod.ai/v2/{RUNPOD_ENDPOINT_ID}/openai/v1",
 )
 
+def _ug40_complete(messages: list) -> str:
+    request = {
+        "model": MODEL_NAME,
+        "messages": messages,
+        "temperature": 0.7,
+    }
+
+    def send():
+        response = client.chat.completions.create(**request)
+        return {"content": response.choices[0].message.content}
+
+    return get_transport().exchange("ug40_chat", request, send)["content"].strip()
+
+
 @backoff.on_exception(backoff.expo, requests.exceptions.RequestException, max_tries=5)
 def ug40_translate(instruction: str, language: str) -> str:
     """
@@ -40,22 +61,55 @@ def ug40_translate(instruction: str, language: str) -> str:
         Exception: If the translation process fails.
     """
     try:
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": "You are a multilingual assistant specialising in Ugandan languages. You give accurate, precise translations."},
-                {"role": "user", "content": f"Translate to {language}: {instruction}"},
-            ],
-            temperature=0.7,
-        )
-        return response.choices[0].message.content.strip()
+        return _ug40_complete([
+            {"role": "system", "content": "You are a multilingual assistant specialising in Ugandan languages. You give accurate, precise translations."},
+            {"role": "user", "content": f"Translate to {language}: {instruction}"},
+        ])
     except Exception as e:
         logger.error(f"Error in translation: {e}")
         raise Exception("Translation failed.") from e
 
 
+@backoff.on_exception(backoff.expo, requests.exceptions.RequestException, max_tries=5)
+def ug40_answer(question: str, language: str) -> str:
+    """
+    Answers a tourism question directly in the specified language with the
+    Ugandan-language-tuned model, in a single call.
+
+    Args:
+        question (str): The user's question, in any supported language.
+        language (str): The language to answer in (e.g., "Luganda").
+
+    Returns:
+        str: The answer.
+
+    Raises:
+        Exception: If the call fails.
+    """
+    try:
+        return _ug40_complete([
+            {"role": "system", "content": f"You are a friendly Jinja tour guide and a multilingual assistant specialising in Ugandan languages. Reply only in {language}."},
+            {"role": "user", "content": question},
+        ])
+    except Exception as e:
+        logger.error(f"Error in answer generation: {e}")
+        raise Exception("Answer generation failed.") from e
+
+
 @backoff.on_exception(backoff.expo, requests.exceptions.RequestException, max_tries=5)
 def translate(text, source_language, target_language):
+    # Approved translations of the same or very similar segments skip NLLB entirely.
+    remembered = get_translation_memory().lookup(text, source_language, target_language)
+    if remembered is not None:
+        return remembered
+    translated = _nllb_translate(text, source_language, target_language)
+    if source_language == "eng":
+        translated = get_translation_memory().apply_glossary(text, translated, target_language)
+    return translated
+
+
+@lru_cache(maxsize=TRANSLATION_CACHE_SIZE)
+def _nllb_translate(text, source_language, target_language):
     try:
         url = "https://api.sunbird.ai/tasks/nllb_translate"
         token = os.getenv("AUTH_TOKEN", st.secrets["AUTH_TOKEN"])
@@ -71,26 +125,41 @@ def translate(text, source_language, target_language):
             "text": text,
         }
 
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        # print(f"Response: {response.json()}")
-        return response.json()["output"].get("translated_text")
+        def send():
+            response = requests.post(url, headers=headers, json=data)
+            response.raise_for_status()
+            return response.json()
+
+        payload = get_transport().exchange("nllb_translate", data, send)
+        # print(f"Response: {payload}")
+        translated_text = payload["output"].get("translated_text")
+        # Raise rather than return None so lru_cache does not keep the failure.
+        if translated_text is None:
+            raise ValueError("NLLB response has no translated_text.")
+        return translated_text
     except Exception as e:
         logger.error(f"Error in translation: {e}")
         raise Exception("Translation failed.") from e
 
+def clear_translation_cache() -> None:
+    _nllb_translate.cache_clear()
+
+
 def translate_texts(texts: list, source_language: str = "eng", target_language: str = "lug") -> str:
-    translated_texts = []
-    for line in texts:
-        line = line.strip()
-        logger.info(f"Translating line: {line}")
-        if not line:
-            continue
-        try:
-            translated_texts.append(translate(line, source_language, target_language) + "\n")
-        except Exception as e:
-            return "**Error:** Some thing wrong happened! Please try again."
-    final_text = "".join(translated_texts)
+    lines = [line.strip() for line in texts if line.strip()]
+    # Repeated lines are translated once and the rest run concurrently.
+    unique_lines = list(dict.fromkeys(lines))
+    logger.info(f"Translating {len(lines)} lines ({len(unique_lines)} unique)")
+    try:
+        with ThreadPoolExecutor(max_workers=TRANSLATE_MAX_WORKERS) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, translate, line, source_language, target_language)
+                for line in unique_lines
+            ]
+            translated = {line: future.result() for line, future in zip(unique_lines, futures)}
+        final_text = "".join(translated[line] + "\n" for line in lines)
+    except Exception as e:
+        return "**Error:** Some thing wrong happened! Please try again."
     return final_text
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+# One approved pair per line: {"source", "target", "source_language", "target_language"}
+SEGMENTS_PATH = os.path.join(UTILS_DIR, "translation_memory.jsonl")
+# English term -> {language code: rendering}; a missing code keeps the English form.
+GLOSSARY_PATH = os.path.join(UTILS_DIR, "glossary.json")
+
+# Placeholders, words (with apostrophes) and numbers; punctuation and case are ignored.
+TOKEN_RE = re.compile(r"⟨\d+⟩|\w+(?:['’]\w+)*")
+
+
+def _placeholder(i: int) -> str:
+    return f"⟨{i}⟩"
+
+
+class TranslationMemory:
+    """
+    Approved English -> Luganda/Runyankole segment pairs, looked up by
+    normalised source text: case and punctuation are ignored.
+
+    Glossary terms (place names, etc.) are replaced by numbered placeholders
+    before matching, so "Bujagali Falls offers …" can serve "Itanda Falls
+    offers …" with the query's own terms filled back in from the glossary.
+
+    Every other word and number must match: hits are shown to users without
+    review, and near matches ("is safe" / "is not safe", "over 12" / "over 16")
+    often mean something else.
+    """
+
+    def __init__(self, glossary: dict = None):
+        self.glossary = {term.lower(): (term, renderings) for term, renderings in (glossary or {}).items()}
+        self._segments = {}
+        self._lock = threading.Lock()
+        terms = sorted((term for term, _ in self.glossary.values()), key=len, reverse=True)
+        self._term_re = re.compile(r"\b(" + "|".join(map(re.escape, terms)) + r")\b", re.IGNORECASE) if terms else None
+
+    def _mask(self, text: str):
+        terms = []
+
+        def repl(match):
+            terms.append(self.glossary[match.group(0).lower()][0])
+            return _placeholder(len(terms) - 1)
+
+        masked = self._term_re.sub(repl, text) if self._term_re else text
+        return masked, terms
+
+    def _render(self, term: str, language: str) -> str:
+        return self.glossary[term.lower()][1].get(language, term)
+
+    def _key(self, masked: str, source_language: str, target_language: str) -> tuple:
+        return source_language, target_language, tuple(TOKEN_RE.findall(masked.lower()))
+
+    def add(self, source: str, target: str, source_language: str, target_language: str) -> None:
+        """Stores a pair; a later pair for the same normalised source replaces the earlier one."""
+        masked_source, terms = self._mask(source)
+        masked_target, movable = target, set()
+        for i, term in enumerate(terms):
+            rendering = re.escape(self._render(term, target_language))
+            masked_target, found = re.subn(rendering, _placeholder(i), masked_target, count=1, flags=re.IGNORECASE)
+            if found:
+                movable.add(i)
+        with self._lock:
+            self._segments[self._key(masked_source, source_language, target_language)] = (masked_target, terms, movable)
+
+    def lookup(self, text: str, source_language: str, target_language: str):
+        """
+        Returns the stored translation of ``text``, or ``None`` if no stored
+        source has the same words and numbers outside glossary terms.
+        """
+        masked, terms = self._mask(text)
+        with self._lock:
+            segment = self._segments.get(self._key(masked, source_language, target_language))
+        if segment is None:
+            return None
+        masked_target, stored_terms, movable = segment
+        # Terms whose rendering was not found in the stored target cannot be swapped.
+        if any(terms[i] != stored_terms[i] for i in range(len(terms)) if i not in movable):
+            return None
+        for i, term in enumerate(terms):
+            masked_target = masked_target.replace(_placeholder(i), self._render(term, target_language))
+        logger.info(f"Translation memory hit for: {text}")
+        return masked_target
+
+    def apply_glossary(self, source: str, translated: str, target_language: str) -> str:
+        """
+        Enforces glossary renderings on a machine translation of ``source``:
+        any glossary term copied through untranslated is replaced by its
+        rendering in ``target_language``.
+        """
+        _, terms = self._mask(source)
+        for term in dict.fromkeys(terms):
+            rendering = self._render(term, target_language)
+            if rendering.lower() != term.lower():
+                translated = re.sub(r"\b" + re.escape(term) + r"\b", rendering, translated, flags=re.IGNORECASE)
+        return translated
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+
+@lru_cache(maxsize=1)
+def get_translation_memory() -> TranslationMemory:
+    glossary = {}
+    if os.path.exists(GLOSSARY_PATH):
+        with open(GLOSSARY_PATH, "r", encoding="utf-8") as f:
+            glossary = json.load(f)
+    memory = TranslationMemory(glossary)
+    if os.path.exists(SEGMENTS_PATH):
+        with open(SEGMENTS_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    pair = json.loads(line)
+                    memory.add(pair["source"], pair["target"], pair["source_language"], pair["target_language"])
+    logger.info(f"Loaded {len(memory)} translation memory segments")
+    return memory
+
+
+def promote(source: str, target: str, source_language: str, target_language: str, path: str = SEGMENTS_PATH) -> bool:
+    """
+    Appends a reviewed translation to the memory file and the loaded memory.
+
+    Returns:
+        bool: False if the memory already returns ``target`` for ``source``.
+    """
+    memory = get_translation_memory()
+    if memory.lookup(source, source_language, target_language) == target:
+        return False
+    pair = {"source": source, "target": target, "source_language": source_language, "target_language": target_language}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(pair, ensure_ascii=False) + "\n")
+    memory.add(source, target, source_language, target_language)
+    return True
+
+
+if __name__ == "__main__":
+    # Promote reviewed NLLB output, one "source<TAB>target" pair per line:
+    #   python -m src.utils.translation_memory --to lug reviewed.tsv
+    parser = argparse.ArgumentParser(description="Add reviewed translations to the translation memory.")
+    parser.add_argument("pairs", help="TSV file of reviewed source<TAB>target pairs")
+    parser.add_argument("--from", dest="source_language", default="eng")
+    parser.add_argument("--to", dest="target_language", required=True, choices=["lug", "nyn"])
+    args = parser.parse_args()
+    added = 0
+    with open(args.pairs, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                source, target = line.rstrip("\n").split("\t")
+                added += promote(source.strip(), target.strip(), args.source_language, args.target_language)
+    print(f"Added {added} pair(s) to {SEGMENTS_PATH}")
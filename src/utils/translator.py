@@ -1,24 +1,40 @@
 import streamlit as st
-from src.config import SUPPORTED_LANGUAGES
-from src.utils.chat import call_openai
+from src.config import SUPPORTED_LANGUAGES, ASR_LANGUAGE_CODES
 from src.utils.common import validate_input
+from src.utils.language_id import detect_language
+from src.utils.translate import translate_texts
+
+AUTO_DETECT = "Auto-detect"
+LANGUAGE_NAMES = {code: name for name, code in ASR_LANGUAGE_CODES.items()}
 
 def handle_translation_tab():
     src_text = st.text_area("Enter text to translate", height=120)
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
-        tgt_lang = st.selectbox("Translate into …", list(SUPPORTED_LANGUAGES.keys()))
+        src_lang = st.selectbox("Translate from …", [AUTO_DETECT] + list(SUPPORTED_LANGUAGES.keys()))
     with col2:
+        tgt_lang = st.selectbox("Translate into …", list(SUPPORTED_LANGUAGES.keys()))
+    with col3:
         do_translate = st.button("Translate")
 
     if do_translate and validate_input(src_text):
-        messages = [
-            {"role": "system", "content": f"You are a multilingual translator. Translate to {tgt_lang}."},
-            {"role": "user", "content": src_text}
-        ]
-        with st.spinner("Translating…"):
-            result = call_openai(messages)
-            st.session_state.last_translation = result
+        if src_lang == AUTO_DETECT:
+            src_code = detect_language(src_text)
+            if src_code is None:
+                st.warning("Could not detect the language of this text. Please choose it under 'Translate from'.")
+                return
+            st.caption(f"Detected language: {LANGUAGE_NAMES[src_code]}")
+        else:
+            src_code = ASR_LANGUAGE_CODES[src_lang]
+        tgt_code = ASR_LANGUAGE_CODES[tgt_lang]
+
+        if src_code == tgt_code:
+            result = src_text
+        else:
+            # NLLB via the cached, line-batched path (with translation memory) instead of a chat completion
+            with st.spinner("Translating…"):
+                result = translate_texts(src_text.split("\n"), src_code, tgt_code)
+        st.session_state.last_translation = result
 
     if st.session_state.get("last_translation"):
         st.text_area("Translation", st.session_state.last_translation, height=120)
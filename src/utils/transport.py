@@ -0,0 +1,146 @@
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable
+
+from src.config import TRANSPORT_CASSETTE_PATH, TRANSPORT_MODE, TRANSPORT_REPLAY_LATENCY_SCALE
+
+logger = logging.getLogger(__name__)
+
+# Counters of every Transport.track() block open in the current context, outermost first.
+_tracked = contextvars.ContextVar("transport_tracked", default=())
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+def request_key(service: str, request: dict) -> str:
+    payload = json.dumps([service, request], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Transport:
+    """
+    Runs upstream calls (OpenAI, RunPod, api.sunbird.ai) and keeps per-service
+    call counts and wall-clock time.
+
+    ``request`` is a JSON-serialisable description of the call without secrets;
+    ``send`` performs the real call and returns a JSON-serialisable response.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+
+    def exchange(self, service: str, request: dict, send: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return self._exchange(service, request, send)
+        finally:
+            elapsed = time.perf_counter() - start
+            tracked = _tracked.get()
+            with self._lock:
+                self._stats[service]["calls"] += 1
+                self._stats[service]["seconds"] += elapsed
+                for counters in tracked:
+                    entry = counters.setdefault(service, {"calls": 0, "seconds": 0.0})
+                    entry["calls"] += 1
+                    entry["seconds"] += elapsed
+
+    def _exchange(self, service: str, request: dict, send: Callable[[], Any]) -> Any:
+        return send()
+
+    @contextmanager
+    def track(self):
+        """
+        Count only the calls made inside this block by the current context.
+
+        Unlike :meth:`stats`, this is not mixed with other sessions' traffic.
+        Blocks nest: a call is counted in every enclosing ``track()``.
+        """
+        tracked = {}
+        token = _tracked.set(_tracked.get() + (tracked,))
+        try:
+            yield tracked
+        finally:
+            _tracked.reset(token)
+
+    def stats(self) -> dict:
+        """Return a copy of the per-service call counts and total seconds."""
+        with self._lock:
+            return {service: dict(values) for service, values in self._stats.items()}
+
+
+class RecordingTransport(Transport):
+    """Performs live calls and appends each request/response pair and its latency to a JSONL cassette."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def _exchange(self, service: str, request: dict, send: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        response = send()
+        entry = {
+            "service": service,
+            "key": request_key(service, request),
+            "request": request,
+            "response": response,
+            "latency": round(time.perf_counter() - start, 4),
+        }
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return response
+
+
+class ReplayTransport(Transport):
+    """
+    Serves responses from a cassette without touching the network, sleeping for
+    the recorded latency multiplied by ``latency_scale``. Repeated identical
+    requests cycle through their recordings in order.
+    """
+
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        super().__init__()
+        self.path = path
+        self.latency_scale = latency_scale
+        self._cassette = defaultdict(deque)
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._cassette[entry["key"]].append(entry)
+        logger.info(f"Loaded {sum(map(len, self._cassette.values()))} recordings from {path}")
+
+    def _exchange(self, service: str, request: dict, send: Callable[[], Any]) -> Any:
+        key = request_key(service, request)
+        with self._lock:
+            entries = self._cassette.get(key)
+            if not entries:
+                raise CassetteMiss(f"No {service} recording for request {key[:12]} in {self.path}")
+            entry = entries[0]
+            entries.rotate(-1)
+        if self.latency_scale > 0:
+            time.sleep(entry["latency"] * self.latency_scale)
+        return entry["response"]
+
+
+@lru_cache(maxsize=1)
+def get_transport() -> Transport:
+    if TRANSPORT_MODE == "record":
+        logger.info(f"Recording upstream calls to {TRANSPORT_CASSETTE_PATH}")
+        return RecordingTransport(TRANSPORT_CASSETTE_PATH)
+    if TRANSPORT_MODE == "replay":
+        return ReplayTransport(TRANSPORT_CASSETTE_PATH, TRANSPORT_REPLAY_LATENCY_SCALE)
+    if TRANSPORT_MODE != "live":
+        raise ValueError(f"Unknown TRANSPORT_MODE: {TRANSPORT_MODE}")
+    return Transport()
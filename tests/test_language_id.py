@@ -0,0 +1,53 @@
+import pytest
+
+from src.utils.language_id import detect_language
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Busoga kingdom palace",
+        "Luganda greetings",
+        "Kayaking on the Nile in Jinja",
+        "Entebbe airport to Jinja",
+    ],
+)
+def test_english_with_place_names_keeps_english_ui(text):
+    assert detect_language(text, expected="eng") == "eng"
+
+
+@pytest.mark.parametrize("text", ["Busoga kingdom palace", "Mabira Forest zipline price"])
+def test_english_with_place_names_is_not_called_ugandan(text):
+    assert detect_language(text) in ("eng", None)
+
+
+def test_place_names_alone_are_not_detected():
+    assert detect_language("Jinja to Kampala bus") is None
+
+
+@pytest.mark.parametrize(
+    "text, ui_code",
+    [
+        ("I want to go to Jinja, webale nnyo", "eng"),
+        ("I want to go to Jinja, webale nnyo", "lug"),
+        ("Oli otya, where can I eat rolex in Jinja?", "eng"),
+    ],
+)
+def test_code_switched_text_keeps_ui_language(text, ui_code):
+    assert detect_language(text, expected=ui_code) == ui_code
+
+
+@pytest.mark.parametrize(
+    "text, code",
+    [
+        ("Njagala okugenda e Jinja", "lug"),
+        ("Nsobola okufuna wa emmere?", "lug"),
+        ("Agandi, nimbaasa kushanga nkahi ebyokurya?", "nyn"),
+    ],
+)
+def test_clearly_ugandan_text_overrides_english_ui(text, code):
+    assert detect_language(text, expected="eng") == code
+
+
+def test_english_question_overrides_luganda_ui():
+    assert detect_language("How much does rafting on the Nile cost?", expected="lug") == "eng"
@@ -0,0 +1,50 @@
+from src.utils.translation_memory import TranslationMemory
+
+GLOSSARY = {
+    "Bujagali Falls": {},
+    "Itanda Falls": {},
+    "River Nile": {"lug": "Omugga Kiyira"},
+}
+
+
+def make_memory() -> TranslationMemory:
+    memory = TranslationMemory(GLOSSARY)
+    memory.add(
+        "Rafting on the River Nile is safe for children over 12.",
+        "Okuvuga amaato ku Omugga Kiyira tekuliimu kabi eri abaana abasussa emyaka 12.",
+        "eng",
+        "lug",
+    )
+    memory.add(
+        "Bujagali Falls offers white-water rafting.",
+        "Bujagali Falls eriko okuvuga amaato mu mazzi ag'amaanyi.",
+        "eng",
+        "lug",
+    )
+    return memory
+
+
+def test_negated_sentence_is_not_served_from_memory():
+    memory = make_memory()
+    assert memory.lookup("Rafting on the River Nile is not safe for children over 12.", "eng", "lug") is None
+
+
+def test_different_number_is_not_served_from_memory():
+    memory = make_memory()
+    assert memory.lookup("Rafting on the River Nile is safe for children over 16.", "eng", "lug") is None
+
+
+def test_glossary_terms_are_swapped_on_a_hit():
+    memory = make_memory()
+    assert (
+        memory.lookup("Itanda Falls offers white-water rafting", "eng", "lug")
+        == "Itanda Falls eriko okuvuga amaato mu mazzi ag'amaanyi."
+    )
+
+
+def test_case_and_punctuation_are_ignored():
+    memory = make_memory()
+    assert (
+        memory.lookup("rafting on the river nile is safe for children over 12", "eng", "lug")
+        == "Okuvuga amaato ku Omugga Kiyira tekuliimu kabi eri abaana abasussa emyaka 12."
+    )